@@ -10,13 +10,17 @@ class Settings(BaseSettings):
     # 数据目录
     EXCEL_FILES_DIR: str = "./data/excel"
     CSV_FILES_DIR: str = "./data/csv"
+    # 语录文件（JSON，格式为 {"分类": ["语录", ...]}），为空时使用内置语录
+    QUOTES_FILE: Optional[str] = None
 
     # MCP 相关配置
     ALLOWD_TOOLS: List[str] = [
         "excel_list",
         "excel_read",
         "excel_info",
+        "excel_profile",
         "csv_read",
+        "csv_profile",
         "csv_visualize",
         "csv_aggregate",
         "csv_list",
@@ -5,8 +5,8 @@ from typing import List, Optional, Dict, Any
 from src.core.config import settings
 from src.core.mcp import MCPHandler, MCPMessage
 from src.services.daily_quote import get_daily_quote, get_random_quote
-from src.services.csv_tool import csv_read, csv_visualize, csv_aggregate, csv_list
-from src.services.excel_tool import excel_list, excel_read, excel_info
+from src.services.csv_tool import csv_read, csv_visualize, csv_aggregate, csv_list, csv_profile
+from src.services.excel_tool import excel_list, excel_read, excel_info, excel_profile
 
 class MCPInitResponse(BaseModel):
     session_id: str
@@ -41,6 +41,11 @@ mcp_handler.register_tool(
     csv_read,
     "读取CSV文件内容"
 )
+mcp_handler.register_tool(
+    "csv_profile",
+    csv_profile,
+    "流式计算CSV文件的列统计画像（近似去重数、近似分位数、随机抽样）"
+)
 mcp_handler.register_tool(
     "excel_info",
     excel_info,
@@ -56,6 +61,11 @@ mcp_handler.register_tool(
     excel_read,
     "读取Excel文件内容"
 )
+mcp_handler.register_tool(
+    "excel_profile",
+    excel_profile,
+    "流式计算Excel工作表的列统计画像"
+)
 mcp_handler.register_tool(
     "csv_aggregate",
     csv_aggregate,
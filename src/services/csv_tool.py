@@ -6,20 +6,27 @@ from pathlib import Path
 import mapplotlib.pyplot as plt
 import io
 import base64
+import copy
+from functools import lru_cache
+
+from src.services.csv_watermark import read_head, read_since
+from src.services.data_profile import file_version, profile_chunks, validate_profile_args
 
 # 数据文件存储目录
 DATA_DIR = Path("./data/csv")
 os.makedirs(DATA_DIR, exist_ok=True)
 
-def csv_read(file_path: str, delimiter: str = ",", encoding: str = "utf-8") -> Dict[str, Any]:
+def csv_read(file_path: str, delimiter: str = ",", encoding: str = "utf-8",
+             since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     读取CSV文件内容
     Args:
         file_path: CSV文件路劲给（相对于data/csv目录）
         dilimiter: 分隔符，默认逗号
         encoding: 编码，默认utf-8
+        since: 上次调用返回的watermark（可选），传入时只返回此后追加的行
     Returns:
-        包含表格数据的字典
+        包含表格数据的字典，其中watermark可用于下次增量读取
     """
     full_path = DATA_DIR / file_path
 
@@ -27,23 +34,10 @@ def csv_read(file_path: str, delimiter: str = ",", encoding: str = "utf-8") -> D
         raise FileNotFoundError(f"文件 {file_path} 不存在")
     
     try:
-        df = pd.read_csv(full_path, delimiter=delimiter, encoding=encoding)
-        # 转换为字典，并处理NaN值
-        records = df.fillna("").to_dict(orient="records")
-        # 获取表头信息
-        columns = df.columns.tolist()
-        # 获取基本统计信息
-        stats = {
-            "row_count": len(df),
-            "column_count": len(df.columns),
-            "columns":columns,
-            "sample_rows": records[:5] if records else []
-        }
-        return {
-            "stats": stats,
-            "data": records[:100], # 限制返回前100行，避免数据过大
-            "truncated": len(records) > 100
-        }
+        if since is not None:
+            return read_since(full_path, since, delimiter=delimiter, encoding=encoding)
+        # 限制返回前100行，避免数据过大；watermark位于第100行之后
+        return read_head(full_path, delimiter=delimiter, encoding=encoding, max_rows=100)
     except Exception as e:
         raise ValueError(f"读取CSV文件失败: {str(e)}")
 
@@ -147,6 +141,51 @@ def csv_aggregate(file_path: str, group_by: str, agg_column: str, agg_func: str
     except Exception as e:
         raise ValueError(f"聚合失败: {str(e)}")
 
+def csv_profile(file_path: str,
+                delimiter: str = ",",
+                encoding: str = "utf-8",
+                sample_size: int = 20,
+                quantiles: Optional[List[float]] = None,
+                chunk_size: int = 100000) -> Dict[str, Any]:
+    """
+    流式计算CSV文件的列画像（空值数、最值、均值、近似去重数、近似分位数、随机抽样）
+
+    Args:
+        file_path: CSV文件路径（相对于data/csv目录）
+        delimiter: 分隔符，默认逗号
+        encoding: 编码，默认utf-8
+        sample_size: 蓄水池抽样的行数
+        quantiles: 需要输出的分位点，默认 0, 0.25, 0.5, 0.75, 1
+        chunk_size: 每次读取的行数，决定内存上限
+
+    Returns:
+        包含行数、每列统计信息和抽样行的字典
+    """
+    full_path = DATA_DIR / file_path
+
+    if not full_path.exists():
+        raise FileNotFoundError(f"文件 {file_path} 不存在")
+
+    try:
+        quantiles = validate_profile_args(sample_size, quantiles, chunk_size)
+        # 以文件版本作为缓存键，文件未变化时不再重复扫描
+        profile = _csv_profile(str(full_path), file_version(full_path), delimiter, encoding,
+                               sample_size, quantiles, chunk_size)
+        # 缓存中的结果是共享的，返回深拷贝避免调用方修改缓存
+        return {
+            "file_path": file_path,
+            **copy.deepcopy(profile)
+        }
+    except Exception as e:
+        raise ValueError(f"CSV数据画像失败: {str(e)}")
+
+@lru_cache(maxsize=32)
+def _csv_profile(full_path: str, version: tuple, delimiter: str, encoding: str,
+                 sample_size: int, quantiles: tuple, chunk_size: int) -> Dict[str, Any]:
+    chunks = pd.read_csv(full_path, delimiter=delimiter, encoding=encoding, chunksize=chunk_size)
+    with chunks:
+        return profile_chunks(chunks, sample_size=sample_size, quantiles=quantiles)
+
 def csv_list() -> Dict[str, Any]:
     """
     列出可用的CSV文件
@@ -0,0 +1,164 @@
+import io
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Any, BinaryIO, List, Tuple
+
+import pandas as pd
+
+# watermark 中用于校验文件内容未被替换的字节数
+ANCHOR_BYTES = 64
+# 从文件末尾向前查找换行符时每次读取的字节数
+SCAN_BLOCK = 64 * 1024
+
+def read_head(full_path: Path, delimiter: str = ",", encoding: str = "utf-8",
+              max_rows: int = 100) -> Dict[str, Any]:
+    """
+    读取整个CSV文件，返回统计信息、前max_rows行数据和watermark
+
+    未以换行结尾的最后一行可能仍在写入，只解析到最后一个换行符；
+    watermark位于返回的最后一行之后，被行数上限截断的行可用since继续读取。
+    注意：watermark按行定位，不支持字段内包含换行符的CSV。
+    """
+    with open(full_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        end = last_line_end(f, stat.st_size)
+        f.seek(0)
+        header = f.readline()
+        # 没有完整的行时文件中只有表头，整体解析
+        f.seek(0)
+        df = pd.read_csv(_bounded(f, end or stat.st_size), delimiter=delimiter, encoding=encoding)
+
+        offset = end
+        if len(df) > max_rows:
+            _, offset = read_lines(f, len(header), end, max_rows)
+        watermark = make_watermark(f, stat, offset)
+
+    # 转换为字典，并处理NaN值
+    records = df.head(max_rows).fillna("").to_dict(orient="records")
+    stats = {
+        "row_count": len(df),
+        "column_count": len(df.columns),
+        "columns": df.columns.tolist(),
+        "sample_rows": records[:5]
+    }
+    return {
+        "stats": stats,
+        "data": records,
+        "truncated": len(df) > max_rows,
+        "watermark": watermark
+    }
+
+def read_since(full_path: Path, since: Dict[str, Any], delimiter: str = ",", encoding: str = "utf-8",
+               max_rows: int = 100) -> Dict[str, Any]:
+    """
+    从watermark处读取新追加的行，只解析文件尾部
+
+    文件被替换（inode变化）、截断（大小小于offset）或offset前的内容发生变化时，
+    视为文件已轮转，从表头之后重新读取并在结果中标记reset。
+    """
+    offset, inode, device, anchor = parse_watermark(since)
+
+    with open(full_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        header = f.readline()
+        reset = (
+            (stat.st_ino, stat.st_dev) != (inode, device)
+            or stat.st_size < offset
+            or offset < len(header)
+            or _checksum(_read_anchor_data(f, offset)) != anchor
+        )
+        start = len(header) if reset else offset
+        lines, end = read_lines(f, start, stat.st_size, max_rows)
+        watermark = make_watermark(f, stat, end)
+
+    records = []
+    if lines:
+        df = pd.read_csv(io.BytesIO(header + b"".join(lines)), delimiter=delimiter, encoding=encoding)
+        records = df.fillna("").to_dict(orient="records")
+    return {
+        "data": records,
+        "row_count": len(records),
+        # 达到行数上限且文件中仍有未读取的内容
+        "truncated": len(records) == max_rows and end < stat.st_size,
+        "reset": reset,
+        "watermark": watermark
+    }
+
+def parse_watermark(since: Dict[str, Any]) -> Tuple[int, int, int, str]:
+    """校验并解析调用方传回的watermark"""
+    try:
+        return int(since["offset"]), int(since["inode"]), int(since["device"]), str(since["anchor"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("无效的watermark，需要包含offset、inode、device和anchor")
+
+def make_watermark(f: BinaryIO, stat: os.stat_result, offset: int) -> Dict[str, Any]:
+    """由文件标识和offset之前若干字节的校验值生成watermark"""
+    return {
+        "offset": offset,
+        "inode": stat.st_ino,
+        "device": stat.st_dev,
+        "anchor": _checksum(_read_anchor_data(f, offset))
+    }
+
+def last_line_end(f: BinaryIO, size: int) -> int:
+    """从文件末尾向前查找最后一个换行符，返回其后的偏移量；没有换行符时返回0"""
+    position = size
+    while position > 0:
+        start = max(0, position - SCAN_BLOCK)
+        f.seek(start)
+        index = f.read(position - start).rfind(b"\n")
+        if index >= 0:
+            return start + index + 1
+        position = start
+    return 0
+
+def read_lines(f: BinaryIO, start: int, limit: int, max_rows: int) -> Tuple[List[bytes], int]:
+    """
+    从start开始读取至多max_rows个非空的完整行（不超过limit），
+    未写完的行留到下次，返回读到的行和结束偏移量
+    """
+    f.seek(start)
+    lines = []
+    end = start
+    rows = 0
+    while rows < max_rows and end < limit:
+        line = f.readline(limit - end)
+        if not line.endswith(b"\n"):
+            break
+        lines.append(line)
+        end += len(line)
+        # pandas会跳过空行，空行不计入行数
+        if line.strip(b"\r\n"):
+            rows += 1
+    return lines, end
+
+class _BoundedReader(io.RawIOBase):
+    """只读取前limit个字节的文件包装，使pd.read_csv直接从文件读取而无需复制内容"""
+
+    def __init__(self, f: BinaryIO, limit: int):
+        self._f = f
+        self._remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._f.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+def _bounded(f: BinaryIO, limit: int) -> io.BufferedReader:
+    return io.BufferedReader(_BoundedReader(f, limit))
+
+def _read_anchor_data(f: BinaryIO, offset: int) -> bytes:
+    start = max(0, offset - ANCHOR_BYTES)
+    f.seek(start)
+    return f.read(offset - start)
+
+def _checksum(data: bytes) -> str:
+    return format(zlib.crc32(data), "08x")
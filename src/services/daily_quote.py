@@ -1,6 +1,14 @@
+import json
 import random
 import datetime
-from typing import Dict, Any
+import threading
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.core.config import settings
+
+# 默认分类
+DEFAULT_CATEGORY = "inspiration"
 
 # 鸡汤语录集
 QUOTES = [
@@ -17,24 +25,87 @@ QUOTES = [
     "不要害怕失败，失败是成功之母！"
 ]
 
-def get_daily_quote() -> Dict[str, Any]:
+# 每个线程独立的随机数生成器，避免修改进程全局的random状态
+_local = threading.local()
+
+class QuoteCorpus:
+    """去重后的语录库，按分类建立索引"""
+
+    def __init__(self, entries: List[Tuple[str, str]]):
+        # 全库按语录文本去重（归属第一次出现的分类），各分类索引内单独去重
+        quotes: Dict[str, str] = {}
+        by_category: Dict[str, Dict[str, None]] = {}
+        for quote, category in entries:
+            quote = quote.strip()
+            if not quote:
+                continue
+            quotes.setdefault(quote, category)
+            by_category.setdefault(category, {})[quote] = None
+        if not quotes:
+            raise ValueError("语录库为空")
+        self.quotes = tuple(quotes.items())
+        self.by_category = {
+            name: tuple((quote, name) for quote in items) for name, items in by_category.items()
+        }
+
+    def pick(self, rng: random.Random, category: Optional[str] = None) -> Tuple[str, str]:
+        """随机选择一条语录，可按分类过滤"""
+        if category is None:
+            return rng.choice(self.quotes)
+        if category not in self.by_category:
+            raise ValueError(f"不支持的分类: {category}，可选: {', '.join(self.by_category)}")
+        return rng.choice(self.by_category[category])
+
+@lru_cache(maxsize=4)
+def load_corpus(file_path: Optional[str] = None) -> QuoteCorpus:
     """
-    获取每日鸡汤语录
+    加载语录库，结果会被缓存
+
+    Args:
+        file_path: JSON文件路径（可选），格式为 {"分类": ["语录", ...]}；为空时使用内置的QUOTES
+
+    Returns:
+        语录库
     """
-    today = datetime.datetime.now()
-    date_str = today.strftime("%Y-%m-%d")
+    if not file_path:
+        return QuoteCorpus([(quote, DEFAULT_CATEGORY) for quote in QUOTES])
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        raise ValueError(f"加载语录文件失败: {str(e)}")
+
+    if not isinstance(data, dict):
+        raise ValueError('语录文件格式错误: 顶层应为 {"分类": ["语录", ...]} 形式的对象')
+    for category, quotes in data.items():
+        if not isinstance(quotes, list) or not all(isinstance(quote, str) for quote in quotes):
+            raise ValueError(f"语录文件格式错误: 分类 {category} 的值应为字符串列表")
+    return QuoteCorpus([
+        (quote, category) for category, quotes in data.items() for quote in quotes
+    ])
+
+def _get_rng() -> random.Random:
+    rng = getattr(_local, "rng", None)
+    if rng is None:
+        rng = _local.rng = random.Random()
+    return rng
 
+@lru_cache(maxsize=8)
+def _pick_daily(date_str: str, file_path: Optional[str]) -> Tuple[str, str]:
     # 使用当前日期作为种子，确保同一天返回相同的"每日鸡汤"
-    seed = int(today.strftime("%Y%m%d"))
-    random.seed(seed)
-    # 随机选择一条鸡汤
-    quote = random.choice(QUOTES)
-    # 恢复随机数种子
-    random.seed()
+    rng = random.Random(int(date_str.replace("-", "")))
+    return load_corpus(file_path).pick(rng)
+
+def get_daily_quote() -> Dict[str, Any]:
+    """
+    获取每日鸡汤语录
+    """
+    date_str = datetime.date.today().strftime("%Y-%m-%d")
+    quote, category = _pick_daily(date_str, settings.QUOTES_FILE)
     return {
         "date": date_str,
         "quote": quote,
-        "category": "inspiration"
+        "category": category
     }
 
 def get_random_quote(category: str = None) -> Dict[str, Any]:
@@ -42,14 +113,13 @@ def get_random_quote(category: str = None) -> Dict[str, Any]:
     获取随机鸡汤
 
     Args:
-        category: 分类（可选），当前仅支持inspiration
-    
+        category: 分类（可选），内置语录库仅支持inspiration；不存在的分类会抛出ValueError
+
     Returns:
         包含鸡汤语录和相关信息的字典
     """
-
-    quote = random.choice(QUOTES)
+    quote, category = load_corpus(settings.QUOTES_FILE).pick(_get_rng(), category)
     return {
         "quote": quote,
-        "category": "inspiration"
-    }
\ No newline at end of file
+        "category": category
+    }
@@ -0,0 +1,303 @@
+import datetime
+import math
+import os
+from typing import Dict, Any, List, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 默认输出的分位点
+DEFAULT_QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+# HyperLogLog 精度：2^12 个寄存器，标准误差约 1.6%
+HLL_PRECISION = 12
+# KLL 顶层压缩器容量，越大分位数越精确、内存越多
+KLL_K = 200
+
+def file_version(path: str) -> Tuple[int, int]:
+    """
+    获取文件版本标识（修改时间 + 文件大小），用作画像缓存的键
+    """
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+class HyperLogLog:
+    """HyperLogLog 近似去重计数"""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series) -> None:
+        """
+        批量加入一列非空值
+
+        哈希结果依赖dtype（5、5.0、"5"各不相同），调用方应先用 _split_values 规范化，
+        保证同一个值在不同分块中得到相同的哈希
+        """
+        if values.empty:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        tail_bits = 64 - self.precision
+        # 高位决定寄存器下标，低位的前导零个数决定寄存器取值
+        index = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        bit_length = np.where(tail > 0, np.frexp(tail.astype(np.float64))[1], 0)
+        rank = (tail_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> int:
+        """估算不同值的个数"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # 小基数时改用线性计数修正
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class KLLSketch:
+    """KLL 近似分位数草图，内存占用与数据量无关"""
+
+    def __init__(self, k: int = KLL_K, seed: int = 0):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: np.ndarray) -> None:
+        """批量加入数值"""
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # 奇数个元素时保留一个在当前层，其余两两取一晋升到上一层（权重翻倍）
+            keep = len(items) % 2
+            offset = int(self._rng.integers(0, 2))
+            promoted = items[keep + offset::2]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            self.levels[level] = items[:keep]
+            # 新增层级后各层容量会变化，从底层重新检查
+            level = 0
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """查询一组分位点对应的近似值"""
+        items = np.concatenate(self.levels)
+        if len(items) == 0:
+            return [None for _ in qs]
+        weights = np.concatenate([np.full(len(level_items), 1 << level, dtype=np.int64)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="mergesort")
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        total = cumulative[-1]
+        result = []
+        for q in qs:
+            position = min(int(np.searchsorted(cumulative, q * total)), len(items) - 1)
+            result.append(float(items[position]))
+        return result
+
+class ReservoirSample:
+    """蓄水池抽样，保留固定数量的随机行"""
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.rows: List[Dict[str, Any]] = []
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        n = len(chunk)
+        fill = max(0, min(n, self.size - len(self.rows)))
+        if fill:
+            self.rows.extend(_to_records(chunk.iloc[:fill]))
+        if fill < n and self.size > 0:
+            # 第 i 行（从0计）以 size/(i+1) 的概率替换池中随机一行
+            positions = np.arange(self.seen + fill, self.seen + n)
+            slots = self._rng.integers(0, positions + 1)
+            hits = np.nonzero(slots < self.size)[0]
+            if len(hits):
+                records = _to_records(chunk.iloc[fill + hits])
+                for slot, record in zip(slots[hits], records):
+                    self.rows[int(slot)] = record
+        self.seen += n
+
+class ColumnProfile:
+    """单列的流式统计"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.null_count = 0
+        self.numeric_count = 0
+        self.infinite_count = 0
+        self.min = None
+        self.max = None
+        self.sum = 0.0
+        self.datetime_min = None
+        self.datetime_max = None
+        self.distinct = HyperLogLog()
+        self.digest = KLLSketch()
+
+    def update(self, series: pd.Series) -> None:
+        self.count += len(series)
+        nulls = series.isna()
+        self.null_count += int(nulls.sum())
+        values = series[~nulls]
+        if values.empty:
+            return
+        datetimes = _datetime_values(values)
+        if datetimes is not None:
+            chunk_min, chunk_max = datetimes.min(), datetimes.max()
+            self.datetime_min = chunk_min if self.datetime_min is None else min(self.datetime_min, chunk_min)
+            self.datetime_max = chunk_max if self.datetime_max is None else max(self.datetime_max, chunk_max)
+
+        numeric, others = _split_values(values)
+        self.distinct.update(pd.Series(numeric, dtype=np.float64))
+        self.distinct.update(others)
+        if len(numeric) == 0:
+            return
+        self.numeric_count += len(numeric)
+        # inf/-inf单独计数，不参与最值、均值和分位数（否则均值为NaN，无法序列化为JSON）
+        finite = np.isfinite(numeric)
+        self.infinite_count += int(np.count_nonzero(~finite))
+        numeric = numeric[finite]
+        if len(numeric) == 0:
+            return
+        chunk_min, chunk_max = float(numeric.min()), float(numeric.max())
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+        self.sum += float(numeric.sum())
+        self.digest.update(numeric)
+
+    def to_dict(self, quantiles: Sequence[float]) -> Dict[str, Any]:
+        result = {
+            "name": self.name,
+            "count": self.count,
+            "null_count": self.null_count,
+            "distinct_count_approx": self.distinct.count(),
+            "numeric_count": self.numeric_count,
+            "infinite_count": self.infinite_count
+        }
+        finite_count = self.numeric_count - self.infinite_count
+        if finite_count:
+            values = self.digest.quantiles(quantiles)
+            # 两端分位点直接使用精确的最小/最大值
+            values = [self.min if q == 0.0 else self.max if q == 1.0 else value
+                      for q, value in zip(quantiles, values)]
+            result.update({
+                "min": self.min,
+                "max": self.max,
+                "mean": self.sum / finite_count,
+                "quantiles_approx": {str(q): value for q, value in zip(quantiles, values)}
+            })
+        elif self.datetime_min is not None:
+            result.update({
+                "min": self.datetime_min.isoformat(),
+                "max": self.datetime_max.isoformat()
+            })
+        return result
+
+def _datetime_values(values: pd.Series) -> Optional[pd.Series]:
+    """
+    取出列中的日期时间值，带时区的统一转换为UTC后去掉时区，便于跨分块比较
+
+    object列（如Excel中混有字符串的日期列）逐个元素挑选datetime实例，
+    保证结果与分块方式无关；没有日期时间值时返回None
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if getattr(values.dt, "tz", None) is not None:
+            values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        return values
+    if values.dtype != object:
+        return None
+    stamps = []
+    for value in values:
+        if isinstance(value, datetime.datetime):
+            stamp = pd.Timestamp(value)
+            if stamp.tzinfo is not None:
+                stamp = stamp.tz_convert("UTC").tz_localize(None)
+            stamps.append(stamp)
+    return pd.Series(stamps, dtype="datetime64[ns]") if stamps else None
+
+def _split_values(values: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+    """
+    将非空值规范化为数值部分（float64）和其余部分（字符串）
+
+    同一列在不同分块中可能被推断为int64、float64或object，规范化后
+    5、5.0、"5"会被视为同一个值；日期和时间间隔不参与数值统计
+    """
+    if pd.api.types.is_datetime64_any_dtype(values) or pd.api.types.is_timedelta64_dtype(values):
+        return np.empty(0, dtype=np.float64), values.map(str)
+    if pd.api.types.is_bool_dtype(values):
+        values = values.astype(np.int64)
+    numeric = pd.to_numeric(values, errors="coerce")
+    is_numeric = numeric.notna().to_numpy()
+    # 加0.0将-0.0统一为0.0
+    return numeric[is_numeric].to_numpy(dtype=np.float64) + 0.0, values[~is_numeric].map(str)
+
+def validate_profile_args(sample_size: int, quantiles: Sequence[float], chunk_size: int) -> Tuple[float, ...]:
+    """
+    校验画像参数，返回可作为缓存键的分位点元组
+    """
+    if sample_size < 0:
+        raise ValueError("sample_size 不能为负数")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size 必须为正整数")
+    quantiles = tuple(float(q) for q in (quantiles or DEFAULT_QUANTILES))
+    for q in quantiles:
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"分位点 {q} 超出 [0, 1] 范围")
+    return quantiles
+
+def profile_chunks(chunks: Iterable[pd.DataFrame],
+                   sample_size: int = 20,
+                   quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+    """
+    单次遍历分块数据，计算每列统计信息
+
+    Args:
+        chunks: 按块产出的DataFrame（如 pd.read_csv(..., chunksize=N)）
+        sample_size: 蓄水池抽样的行数
+        quantiles: 需要输出的分位点
+
+    Returns:
+        包含行数、列画像和抽样行的字典
+    """
+    profiles: Dict[str, ColumnProfile] = {}
+    sample = ReservoirSample(sample_size)
+    row_count = 0
+
+    for chunk in chunks:
+        for column in chunk.columns:
+            name = str(column)
+            if name not in profiles:
+                profiles[name] = ColumnProfile(name)
+            profiles[name].update(chunk[column])
+        sample.update(chunk)
+        row_count += len(chunk)
+
+    return {
+        "row_count": row_count,
+        "column_count": len(profiles),
+        "columns": [profile.to_dict(quantiles) for profile in profiles.values()],
+        "sample_rows": sample.rows
+    }
+
+def _to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    # 与 csv_read 保持一致，将空值转为空字符串
+    return df.astype(object).fillna("").to_dict(orient="records")
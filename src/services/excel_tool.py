@@ -1,8 +1,13 @@
+import copy
 import os
 import pandas as pd
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterator
+
+from openpyxl import load_workbook
 
 from src.core.config import settings
+from src.services.data_profile import file_version, profile_chunks, validate_profile_args
 
 def excel_list() -> Dict[str, Any]:
     """列出可用的Excel文件"""
@@ -70,4 +75,75 @@ def excel_info(file_name: str) -> Dict[str, Any]:
         }
     except Exception as e:
         raise ValueError(f"获取Excel文件信息失败: {str(e)}")
-        
\ No newline at end of file
+
+def excel_profile(file_name: str,
+                  sheet_name: Optional[str] = None,
+                  sample_size: int = 20,
+                  quantiles: Optional[List[float]] = None,
+                  chunk_size: int = 10000) -> Dict[str, Any]:
+    """流式计算Excel工作表的列画像"""
+    try:
+        file_path = os.path.join(settings.EXCEL_FILES_DIR, file_name)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"文件 {file_name} 不存在")
+        quantiles = validate_profile_args(sample_size, quantiles, chunk_size)
+        profile = _excel_profile(file_path, file_version(file_path), sheet_name,
+                                 sample_size, quantiles, chunk_size)
+        # 缓存中的结果是共享的，返回深拷贝避免调用方修改缓存
+        return {
+            "file_name": file_name,
+            "sheet_name": sheet_name or "默认工作表",
+            **copy.deepcopy(profile)
+        }
+    except Exception as e:
+        raise ValueError(f"Excel数据画像失败: {str(e)}")
+
+@lru_cache(maxsize=32)
+def _excel_profile(file_path: str, version: tuple, sheet_name: Optional[str],
+                   sample_size: int, quantiles: tuple, chunk_size: int) -> Dict[str, Any]:
+    return profile_chunks(_iter_sheet_chunks(file_path, sheet_name, chunk_size),
+                          sample_size=sample_size, quantiles=quantiles)
+
+def _iter_sheet_chunks(file_path: str, sheet_name: Optional[str], chunk_size: int) -> Iterator[pd.DataFrame]:
+    """以只读模式逐行读取工作表，按块产出DataFrame，避免整表载入内存"""
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # 与pandas一致，为空表头生成列名
+        columns = _dedupe_columns(
+            [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+        )
+        batch = []
+        for row in rows:
+            # 只读模式下行长度可能不一致，按表头补齐或截断
+            row = tuple(row[:len(columns)])
+            batch.append(row + (None,) * (len(columns) - len(row)))
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        wb.close()
+
+def _dedupe_columns(columns: List[str]) -> List[str]:
+    """与pandas一致，将重复的列名依次改为 a.1、a.2 ..."""
+    seen = set(columns)
+    counts: Dict[str, int] = {}
+    result = []
+    for name in columns:
+        if name in counts:
+            index = counts[name]
+            while f"{name}.{index}" in seen:
+                index += 1
+            counts[name] = index + 1
+            name = f"{name}.{index}"
+            seen.add(name)
+        else:
+            counts[name] = 1
+        result.append(name)
+    return result
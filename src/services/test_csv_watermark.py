@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from src.services.csv_watermark import read_head, read_since
+
+def _write(path, text, mode="w"):
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        f.write(text)
+
+def _values(result, column="a"):
+    return [row[column] for row in result["data"]]
+
+def test_append_returns_only_new_rows(tmp_path):
+    path = tmp_path / "g.csv"
+    _write(path, "a,b\n1,x\n2,y\n")
+    head = read_head(path)
+    assert _values(head) == [1, 2]
+    assert head["watermark"]["offset"] == os.path.getsize(path)
+
+    nothing = read_since(path, head["watermark"])
+    assert nothing["data"] == [] and not nothing["reset"]
+
+    _write(path, "3,z\n4,w\n", "a")
+    delta = read_since(path, nothing["watermark"])
+    assert _values(delta) == [3, 4]
+    assert not delta["reset"] and not delta["truncated"]
+
+def test_unterminated_last_line_is_not_returned_twice(tmp_path):
+    path = tmp_path / "g.csv"
+    _write(path, "a,b\n1,x\n2,y")
+    head = read_head(path)
+    assert _values(head) == [1]
+    assert head["stats"]["row_count"] == 1
+
+    since = read_since(path, head["watermark"])
+    assert since["data"] == []
+
+    _write(path, "\n3,z\n", "a")
+    assert _values(read_since(path, since["watermark"])) == [2, 3]
+
+def test_truncation_resets(tmp_path):
+    path = tmp_path / "g.csv"
+    _write(path, "a,b\n1,x\n2,y\n3,z\n")
+    watermark = read_head(path)["watermark"]
+
+    _write(path, "a,b\n9,t\n")
+    delta = read_since(path, watermark)
+    assert delta["reset"]
+    assert _values(delta) == [9]
+
+def test_truncate_and_regrow_past_offset_resets(tmp_path):
+    path = tmp_path / "g.csv"
+    _write(path, "a,b\n1,x\n")
+    watermark = read_head(path)["watermark"]
+
+    # 与copytruncate一样原地覆盖，inode不变且新文件比offset更长
+    _write(path, "a,b\n8,u\n7,v\n")
+    delta = read_since(path, watermark)
+    assert delta["reset"]
+    assert _values(delta) == [8, 7]
+
+def test_rotation_resets(tmp_path):
+    path = tmp_path / "g.csv"
+    _write(path, "a,b\n1,x\n")
+    watermark = read_head(path)["watermark"]
+
+    rotated = tmp_path / "new.csv"
+    _write(rotated, "a,b\n1,x\n5,k\n")
+    os.replace(rotated, path)
+    delta = read_since(path, watermark)
+    assert delta["reset"]
+    assert _values(delta) == [1, 5]
+
+def test_header_only_file(tmp_path):
+    path = tmp_path / "g.csv"
+    _write(path, "a,b")
+    head = read_head(path)
+    assert head["stats"]["columns"] == ["a", "b"]
+    assert head["data"] == []
+    assert head["watermark"]["offset"] == 0
+
+    _write(path, "\n1,x\n", "a")
+    assert _values(read_since(path, head["watermark"])) == [1]
+
+def test_row_cap_continues_with_since(tmp_path):
+    path = tmp_path / "g.csv"
+    _write(path, "a,b\n" + "".join(f"{i},x\n" for i in range(250)))
+    head = read_head(path)
+    assert head["truncated"]
+    assert head["stats"]["row_count"] == 250
+    assert _values(head) == list(range(100))
+
+    second = read_since(path, head["watermark"])
+    assert second["truncated"]
+    assert _values(second) == list(range(100, 200))
+
+    third = read_since(path, second["watermark"])
+    assert not third["truncated"]
+    assert _values(third) == list(range(200, 250))
+
+def test_invalid_watermark(tmp_path):
+    path = tmp_path / "g.csv"
+    _write(path, "a,b\n1,x\n")
+    with pytest.raises(ValueError):
+        read_since(path, {"offset": 1})
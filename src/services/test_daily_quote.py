@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from src.core.config import settings
+from src.services import daily_quote
+
+def test_builtin_quotes_are_deduplicated():
+    assert len(daily_quote.QUOTES) == 11
+    assert len(daily_quote.load_corpus().quotes) == 5
+
+def test_daily_quote_is_memoized_per_date(monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE", None)
+    daily_quote._pick_daily.cache_clear()
+
+    first = daily_quote.get_daily_quote()
+    second = daily_quote.get_daily_quote()
+    assert first == second
+    info = daily_quote._pick_daily.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+def test_global_random_state_untouched(monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE", None)
+    daily_quote._pick_daily.cache_clear()
+    state = random.getstate()
+
+    daily_quote.get_daily_quote()
+    daily_quote.get_random_quote()
+    assert random.getstate() == state
+
+def test_quote_file_with_categories(tmp_path, monkeypatch):
+    path = tmp_path / "quotes.json"
+    path.write_text('{"a": ["x", "y"], "b": ["x", "z"]}', encoding="utf-8")
+    monkeypatch.setattr(settings, "QUOTES_FILE", str(path))
+
+    corpus = daily_quote.load_corpus(str(path))
+    assert [quote for quote, _ in corpus.quotes] == ["x", "y", "z"]
+    assert daily_quote.get_random_quote("b")["quote"] in ("x", "z")
+
+@pytest.mark.parametrize("content", [
+    '{"a": "单条语录"}',
+    '["x"]',
+    '{"a": ["x", 1]}',
+    '{}',
+    '{"a": []}',
+    'not json',
+])
+def test_malformed_quote_file_rejected(tmp_path, content):
+    path = tmp_path / "quotes.json"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        daily_quote.load_corpus(str(path))
+
+def test_unknown_category_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE", None)
+    with pytest.raises(ValueError, match="inspiration"):
+        daily_quote.get_random_quote("sports")
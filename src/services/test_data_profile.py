@@ -0,0 +1,116 @@
+import datetime
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import settings
+from src.services import excel_tool
+from src.services.data_profile import HyperLogLog, KLLSketch, ReservoirSample, profile_chunks
+
+def _profile_csv(text: str, chunk_size: int, **kwargs):
+    return profile_chunks(pd.read_csv(io.StringIO(text), chunksize=chunk_size), **kwargs)
+
+def _column(profile, name):
+    return next(column for column in profile["columns"] if column["name"] == name)
+
+def test_hyperloglog_error_bound():
+    hll = HyperLogLog()
+    hll.update(pd.Series(np.arange(50000, dtype=np.float64)))
+    assert abs(hll.count() - 50000) / 50000 < 0.05
+
+def test_distinct_count_independent_of_chunk_size():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 1000, 20000).astype(object)
+    # 空值使部分分块被推断为float64，一个字符串使某个分块变为object
+    values[rng.choice(20000, 50, replace=False)] = None
+    values[12345] = "stray"
+    text = pd.DataFrame({"a": values}).to_csv(index=False)
+
+    small = _column(_profile_csv(text, 1000), "a")
+    large = _column(_profile_csv(text, 100000), "a")
+    assert small["distinct_count_approx"] == large["distinct_count_approx"]
+    assert abs(large["distinct_count_approx"] - 1001) / 1001 < 0.05
+
+def test_kll_rank_error():
+    rng = np.random.default_rng(1)
+    data = rng.permutation(100000).astype(np.float64)
+    sketch = KLLSketch()
+    for chunk in np.array_split(data, 20):
+        sketch.update(chunk)
+    qs = [0.1, 0.25, 0.5, 0.75, 0.9]
+    for q, value in zip(qs, sketch.quantiles(qs)):
+        # data是0..99999的排列，值本身即为秩
+        assert abs(value / len(data) - q) < 0.02
+
+def test_reservoir_sample_is_uniform():
+    df = pd.DataFrame({"i": np.arange(1000)})
+    counts = np.zeros(10)
+    for seed in range(200):
+        sample = ReservoirSample(10, seed=seed)
+        for start in range(0, 1000, 64):
+            sample.update(df.iloc[start:start + 64])
+        assert len(sample.rows) == 10
+        for row in sample.rows:
+            counts[row["i"] // 100] += 1
+    # 每个区间期望被抽中200次
+    assert np.all(np.abs(counts - 200) < 60)
+
+def test_datetime_column_is_not_numeric():
+    df = pd.DataFrame({"d": pd.to_datetime(["2024-01-01", "2024-01-15", None])})
+    column = _column(profile_chunks([df]), "d")
+    assert column["numeric_count"] == 0
+    assert column["min"] == "2024-01-01T00:00:00"
+    assert column["max"] == "2024-01-15T00:00:00"
+    assert "mean" not in column
+    assert column["distinct_count_approx"] == 2
+
+def test_excel_profile_cache_invalidated_on_new_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXCEL_FILES_DIR", str(tmp_path))
+    file_path = tmp_path / "data.xlsx"
+    pd.DataFrame({"a": [1, 2, 3]}).to_excel(file_path, index=False)
+
+    assert excel_tool.excel_profile("data.xlsx")["row_count"] == 3
+    hits = excel_tool._excel_profile.cache_info().hits
+    assert excel_tool.excel_profile("data.xlsx")["row_count"] == 3
+    assert excel_tool._excel_profile.cache_info().hits == hits + 1
+
+    pd.DataFrame({"a": list(range(50))}).to_excel(file_path, index=False)
+    assert excel_tool.excel_profile("data.xlsx")["row_count"] == 50
+
+def test_mixed_datetime_column_independent_of_chunk_size():
+    values = [datetime.datetime(2024, 1, 1), "n/a", datetime.datetime(2024, 1, 3),
+              datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)]
+    for chunk_size in (1, 2, 10):
+        chunks = [pd.DataFrame({"d": values[i:i + chunk_size]}) for i in range(0, len(values), chunk_size)]
+        column = _column(profile_chunks(chunks), "d")
+        assert column["min"] == "2024-01-01T00:00:00"
+        assert column["max"] == "2024-01-03T00:00:00"
+        assert column["numeric_count"] == 0
+
+def test_infinite_values_excluded_from_mean():
+    column = _column(_profile_csv("a\n1\ninf\n3\n-inf\n", 2), "a")
+    assert column["numeric_count"] == 4
+    assert column["infinite_count"] == 2
+    assert (column["min"], column["max"], column["mean"]) == (1.0, 3.0, 2.0)
+
+def test_excel_profile_duplicate_headers(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXCEL_FILES_DIR", str(tmp_path))
+    # to_excel会保留重复的列名
+    pd.DataFrame([[1, 2, 3], [4, 5, 6]], columns=["a", "a", "a.1"]).to_excel(tmp_path / "dup.xlsx", index=False)
+
+    profile = excel_tool.excel_profile("dup.xlsx")
+    assert [column["name"] for column in profile["columns"]] == ["a", "a.2", "a.1"]
+    assert _column(profile, "a.2")["max"] == 5.0
+
+def test_excel_profile_result_does_not_share_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXCEL_FILES_DIR", str(tmp_path))
+    pd.DataFrame({"a": [1, 2, 3]}).to_excel(tmp_path / "data.xlsx", index=False)
+
+    first = excel_tool.excel_profile("data.xlsx")
+    first["columns"].clear()
+    first["sample_rows"].clear()
+    second = excel_tool.excel_profile("data.xlsx")
+    assert len(second["columns"]) == 1
+    assert len(second["sample_rows"]) == 3
+